@@ -11,18 +11,29 @@ import pynvml
 import platform
 import copy
 import re
+import queue
+import threading
+import io
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QPushButton, QLabel, QComboBox, QCheckBox,
-                             QFileDialog, QTextEdit, QMessageBox, QInputDialog,
+                             QFileDialog, QTextEdit, QPlainTextEdit, QMessageBox, QInputDialog,
                              QHBoxLayout, QGroupBox, QFormLayout, QLineEdit,
                              QDialog, QTableWidget, QTableWidgetItem, QHeaderView,
                              QTabWidget, QScrollArea, QToolButton, QSizePolicy, QDialogButtonBox)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSize, QTimer, QMutex, QWaitCondition, pyqtSlot, QMetaObject, Q_ARG, QUrl
-from PyQt5.QtGui import QFont, QIcon, QColor, QTextCharFormat, QTextCursor, QPainter, QPixmap, QDesktopServices, QFontInfo
+from PyQt5.QtGui import (QFont, QIcon, QColor, QTextCharFormat, QTextCursor, QPainter, QPixmap, QDesktopServices,
+                         QFontInfo, QStandardItemModel, QStandardItem)
 import resources_rc
 from archive import archive_folders
 import tempfile
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"
 env = os.environ.copy()
 logging.basicConfig(filename='msst_gui.log', level=logging.DEBUG,
@@ -31,6 +42,34 @@ logger = logging.getLogger(__name__)
 
 CONFIG_FILE = 'model_config_zh.json'
 
+# line kind -> (color, italic, separator before, separator after)
+OUTPUT_LINE_STYLES = {
+    "module": ('#6e71ff', False, '=', None),
+    "command": ('yellow', True, None, '-'),
+    "error": ('red', False, None, None),
+    "warning": ('orange', False, None, None),
+    None: ('white', False, None, None)
+}
+
+
+def classify_output_line(text):
+    # Returns the OUTPUT_LINE_STYLES key for a line. Plain prefix/substring checks: a combined regex with
+    # lookaheads was measured several times slower, since it backtracks over every non-matching line
+    if text.startswith("使用模块:"):
+        return "module"
+    if text.startswith("命令:"):
+        return "command"
+    lowered = text.lower()
+    if "error" in lowered:
+        return "error"
+    if "warning" in lowered:
+        return "warning"
+    return None
+
+
+# Parsed CONFIG_FILE keyed by its (st_mtime_ns, st_size), so an unchanged file is never parsed twice
+config_cache = {}
+
 
 def remove_screen_splash():
     # Use this code to signal the splash screen removal.
@@ -56,8 +95,16 @@ def remove_screen_splash():
     logging.debug("Splash screen removal complete")
 
 
+def update_config_cache(config):
+    # Called right after config has been written to CONFIG_FILE, so the next load can skip the re-read
+    stat = os.stat(CONFIG_FILE)
+    config_cache[CONFIG_FILE] = ((stat.st_mtime_ns, stat.st_size), config)
+
+
 def load_or_create_config():
-    if not os.path.exists(CONFIG_FILE):
+    try:
+        stat = os.stat(CONFIG_FILE)
+    except FileNotFoundError:
         initial_config = {
             "vocal_models": {
                 "None": "禁用人声分离模块",
@@ -312,9 +359,18 @@ def load_or_create_config():
         }
         with open(CONFIG_FILE, 'w') as f:
             json.dump(initial_config, f, ensure_ascii=False, indent=4)
+        update_config_cache(initial_config)
+        return initial_config
+
+    cached = config_cache.get(CONFIG_FILE)
+    if cached is not None and cached[0] == (stat.st_mtime_ns, stat.st_size):
+        return cached[1]
 
     with open(CONFIG_FILE, 'r') as f:
-        return json.load(f)
+        # orjson is optional; the text is decoded by open() so existing locale-encoded files still load
+        config = orjson.loads(f.read()) if orjson else json.load(f)
+    config_cache[CONFIG_FILE] = ((stat.st_mtime_ns, stat.st_size), config)
+    return config
 
 
 def organize_instrumental_files(store_dir, main_track):
@@ -559,10 +615,15 @@ class CustomComboBox(QComboBox):
 
 
 class InferenceThread(QThread):
-    update_signal = pyqtSignal(str, bool)  # bool use for tqdm
+    update_signal = pyqtSignal(list, bool)  # batch of lines, bool use for tqdm
     finished_signal = pyqtSignal(dict)
     file_organization_signal = pyqtSignal(int, float)
 
+    # Lines are forwarded to the GUI in batches to cut down on queued cross-thread signals
+    BATCH_SIZE = 20
+    BATCH_INTERVAL = 0.03
+    QUEUE_SIZE = 1000
+
     def __init__(self, commands, input_folder):
         super().__init__()
         self.commands = commands
@@ -581,6 +642,29 @@ class InferenceThread(QThread):
         else:
             return None
 
+    def read_output(self, stream, line_queue):
+        # Runs in a helper thread so that run() can flush pending lines while the process is silent
+        try:
+            for line in stream:
+                if not self.queue_line(line_queue, line):
+                    return
+        except Exception as e:
+            # Hand the failure to run() instead of an end marker; waiting on a child nobody reads from would hang
+            logger.error(f"Failed to read inference output: {e}")
+            self.queue_line(line_queue, e)
+        else:
+            self.queue_line(line_queue, None)
+
+    def queue_line(self, line_queue, line):
+        # After stop() nothing drains the queue any more, so a blocking put on a full queue would never return
+        while True:
+            try:
+                line_queue.put(line, timeout=self.BATCH_INTERVAL)
+                return True
+            except queue.Full:
+                if not self.is_running:
+                    return False
+
     def run(self):
         start_time = time.time()
         summary = {
@@ -604,26 +688,58 @@ class InferenceThread(QThread):
             if not self.is_running:
                 break
             logger.info(f"Starting inference with command: {command}")
-            self.update_signal.emit(f"使用模块: {module_names[store_dir]}", False)
-            self.update_signal.emit(f"命令: {command}", False)
+            self.update_signal.emit([f"使用模块: {module_names[store_dir]}", f"命令: {command}"], False)
             env_path = self.extract_env_path(command)
             new_paths = f'{env_path}Scripts;{env_path}bin;{env_path};'
             if new_paths not in env['PATH']:
                 env['PATH'] = new_paths + env['PATH']
             self.process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                                            text=True, universal_newlines=True, env=env)
-            for line in self.process.stdout:
-                if not self.is_running:
+                                            text=True, universal_newlines=True, errors='replace', env=env)
+            stdout = self.process.stdout
+            line_queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+            reader = threading.Thread(target=self.read_output, args=(stdout, line_queue), daemon=True)
+            reader.start()
+
+            batch = []
+            batch_is_progress = False
+            read_error = None
+            last_emit = time.monotonic()
+            while self.is_running:
+                try:
+                    line = line_queue.get(timeout=self.BATCH_INTERVAL)
+                except queue.Empty:
+                    if batch:
+                        self.update_signal.emit(batch, batch_is_progress)
+                        batch = []
+                    last_emit = time.monotonic()
+                    continue
+                if line is None:
+                    break
+                if isinstance(line, Exception):
+                    read_error = line
                     break
                 stripped_line = line.strip()
-                if line.startswith('\r') or "it/s]" in line:  # if is tqdm
-                    self.update_signal.emit(stripped_line, True)
-                else:
-                    self.update_signal.emit(stripped_line, False)
+                is_progress = line.startswith('\r') or "it/s]" in line  # if is tqdm
+                if batch and is_progress != batch_is_progress:
+                    self.update_signal.emit(batch, batch_is_progress)
+                    batch = []
+                    last_emit = time.monotonic()
+                batch.append(stripped_line)
+                batch_is_progress = is_progress
                 logger.debug(stripped_line)
                 if "error" in line.lower():
                     summary["errors"] += 1
-            if self.is_running:
+                if len(batch) >= self.BATCH_SIZE or time.monotonic() - last_emit > self.BATCH_INTERVAL:
+                    self.update_signal.emit(batch, batch_is_progress)
+                    batch = []
+                    last_emit = time.monotonic()
+            if batch and self.is_running:
+                self.update_signal.emit(batch, batch_is_progress)
+            if read_error is not None:
+                summary["errors"] += 1
+                self.update_signal.emit([f"读取推理输出失败 (error): {read_error}"], False)
+                self.terminate_process()
+            elif self.is_running:
                 self.process.wait()
                 summary["modules"].append((module_names[store_dir], store_dir))
                 logger.info(f"Module {module_names[store_dir]} completed. ")
@@ -634,6 +750,9 @@ class InferenceThread(QThread):
                 self.file_organization_signal.emit(moved_files, time_taken)
             else:
                 self.terminate_process()
+            # The reader has queued its end marker or given up after stop(); wait for it before closing the pipe
+            reader.join()
+            stdout.close()
             logger.info(f"Inference process completed or terminated for {module_names[store_dir]}")
 
         if self.is_running:
@@ -642,7 +761,7 @@ class InferenceThread(QThread):
                 f"Inference completed. Total files: {summary['total_files']}, Time: {summary['total_time']:.2f} seconds")
             self.finished_signal.emit(summary)
         else:
-            self.update_signal.emit("推理已强制终止", False)
+            self.update_signal.emit(["推理已强制终止"], False)
 
     @staticmethod
     def get_current_model_name(command):
@@ -691,6 +810,19 @@ class InferenceThread(QThread):
         self.process = None
 
 
+class ArchiveThread(QThread):
+    output_signal = pyqtSignal(str)
+    finished_signal = pyqtSignal(str)  # error message, empty on success
+
+    def run(self):
+        try:
+            archive_folders(output_callback=self.output_signal.emit)
+        except Exception as e:
+            self.finished_signal.emit(str(e) or type(e).__name__)
+        else:
+            self.finished_signal.emit("")
+
+
 class ModelEditDialog(QDialog):
     def __init__(self, model_name, model_info, config, parent=None):
         super().__init__(parent)
@@ -821,7 +953,11 @@ class ConfigEditorDialog(QDialog):
         self.cancel_button = None
         self.save_button = None
         self.tabs = None
-        self.background_label = None
+        self.background_pixmap = None
+        self.scaled_background = None
+        self.background_resize_timer = QTimer(self)
+        self.background_resize_timer.setSingleShot(True)
+        self.background_resize_timer.timeout.connect(self.resize_background)
         self.original_config = config
         self.working_config = copy.deepcopy(self.original_config)
         self.working_config = self.validate_config(self.working_config)
@@ -1108,6 +1244,7 @@ class ConfigEditorDialog(QDialog):
             self.original_config.update(copy.deepcopy(self.working_config))
             with open(CONFIG_FILE, 'w') as f:
                 json.dump(self.original_config, f, ensure_ascii=False, indent=4)
+            update_config_cache(self.original_config)
             logger.info("Configuration saved successfully")
             self.accept()
         except Exception as e:
@@ -1129,13 +1266,30 @@ class ConfigEditorDialog(QDialog):
         painter.drawPixmap(0, 0, overlay)
         painter.end()
 
-        self.background_label = QLabel(self)
-        self.background_label.setPixmap(background)
-        self.background_label.setScaledContents(True)
-        self.background_label.resize(self.size())
-        self.background_label.lower()
+        self.background_pixmap = background
+        self.scaled_background = background.scaled(self.size(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
         self.setAttribute(Qt.WA_StyledBackground, True)
 
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.scaled_background is not None:
+            # Drawn straight onto the window, so no overlay child takes part in layout or polish.
+            # While a resize is still settling the last smooth copy is stretched with a fast transform.
+            painter = QPainter(self)
+            painter.drawPixmap(self.rect(), self.scaled_background)
+            painter.end()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # Follow only the settled size instead of rescaling the background on every drag step
+        self.background_resize_timer.start(16)
+
+    def resize_background(self):
+        if self.background_pixmap is not None:
+            self.scaled_background = self.background_pixmap.scaled(self.size(), Qt.IgnoreAspectRatio,
+                                                                    Qt.SmoothTransformation)
+            self.update()
+
     def apply_styles(self):
         config_editor_dialog_stylesheet = """
             QDialog { background-color: #ffffff; }
@@ -1186,8 +1340,18 @@ class ConfigEditorDialog(QDialog):
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.background_label = None
+        self.background_pixmap = None
+        self.scaled_background = None
+        self.background_resize_timer = QTimer(self)
+        self.background_resize_timer.setSingleShot(True)
+        self.background_resize_timer.timeout.connect(self.resize_background)
         self.inference_thread = None
+        self.archive_thread = None
+        self.archive_error_box = None
+        self.verified_python = None  # (path, st_mtime_ns) of the system python last seen to run
+        self.scan_executor = None
+        self.presets_mtime = None
+        self.text_formats = {}  # (color, bold, italic) -> QTextCharFormat
         self.setWindowTitle("MSST GUI v1.4     by 领航员未鸟")
         self.scaling_factor = ScalingUtils.get_scaling_factor()
         logger.info(f"Detected scaling factor: {self.scaling_factor}")
@@ -1368,6 +1532,8 @@ class MainWindow(QMainWindow):
         # Action buttons
         action_layout = QHBoxLayout()
         self.run_button = QPushButton("开始推理")
+        self.run_button.setObjectName("run_button")
+        self.run_button.setProperty("state", "run")
         self.run_button.clicked.connect(self.run_inference)
         action_layout.addWidget(self.run_button)
         self.archive_button = QPushButton("归档结果")
@@ -1408,21 +1574,17 @@ class MainWindow(QMainWindow):
         self.output_console.setFont(font)
         main_layout.addWidget(self.output_console)
 
-        # Connect signals
-        self.vocal_model_combo.currentIndexChanged.connect(
-            lambda: self.update_tooltip(self.vocal_model_combo, self.vocal_model_tooltip))
-        self.kara_model_combo.currentIndexChanged.connect(
-            lambda: self.update_tooltip(self.kara_model_combo, self.kara_model_tooltip))
-        self.reverb_model_combo.currentIndexChanged.connect(
-            lambda: self.update_tooltip(self.reverb_model_combo, self.reverb_model_tooltip))
-        self.other_model_combo.currentIndexChanged.connect(
-            lambda: self.update_tooltip(self.other_model_combo, self.other_model_tooltip))
-
-        # Initial tooltip update
-        self.update_tooltip(self.vocal_model_combo, self.vocal_model_tooltip)
-        self.update_tooltip(self.kara_model_combo, self.kara_model_tooltip)
-        self.update_tooltip(self.reverb_model_combo, self.reverb_model_tooltip)
-        self.update_tooltip(self.other_model_combo, self.other_model_tooltip)
+        # Connect signals, all four combos share one slot that looks up the sender's tooltip
+        self.model_combo_tooltips = {
+            self.vocal_model_combo: self.vocal_model_tooltip,
+            self.kara_model_combo: self.kara_model_tooltip,
+            self.reverb_model_combo: self.reverb_model_tooltip,
+            self.other_model_combo: self.other_model_tooltip
+        }
+        for combo, tooltip in self.model_combo_tooltips.items():
+            combo.currentIndexChanged.connect(self.on_model_combo_changed)
+            # Initial tooltip update
+            self.update_tooltip(combo, tooltip)
 
         # Set styles
         main_stylesheet = """
@@ -1460,6 +1622,15 @@ class MainWindow(QMainWindow):
                 padding-top: 10px;
                 padding-bottom: 6px;
             }
+            QPushButton#run_button[state="stop"] {
+                background-color: #FF4136;
+            }
+            QPushButton#run_button[state="stop"]:hover {
+                background-color: #E02F26;
+            }
+            QPushButton#run_button[state="stop"]:pressed {
+                background-color: #C7291F;
+            }
             QComboBox {
                 padding: 5px;
                 border: 1px solid #cccccc;
@@ -1508,6 +1679,12 @@ class MainWindow(QMainWindow):
             QGroupBox, QComboBox, QLineEdit {
             background-color: rgba(255, 255, 255, 220);
             }
+            QPlainTextEdit#validation_text {
+                background-color: #f0f4f8;
+                border: 1px solid #dee2e6;
+                border-radius: 4px;
+                padding: 8px;
+            }
             QLineEdit {
                 padding: 2px 5px;
                 border: 1px solid #cccccc;
@@ -1544,11 +1721,22 @@ class MainWindow(QMainWindow):
     def check_inference_env(self):
         inference_env = self.inference_env_input.text().strip()
         if inference_env.lower() == 'python':
-            # If set to use system Python, check if it's available
-            try:
-                subprocess.run(['python', '--version'], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            # which() rules out a missing Python without spawning anything. A new hit is still run once, because the
+            # Windows Store alias stub in WindowsApps is found on PATH but exits non-zero when Python isn't installed.
+            # Only success is remembered, and a different path or mtime triggers a fresh check
+            python_path = shutil.which('python')
+            if python_path:
+                try:
+                    python_key = (python_path, os.stat(python_path).st_mtime_ns)
+                    if python_key != self.verified_python:
+                        subprocess.run([python_path, '--version'], check=True, stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE)
+                        self.verified_python = python_key
+                except (subprocess.CalledProcessError, OSError):
+                    python_path = None
+            if python_path:
                 logger.info("Using system Python for inference")
-            except subprocess.CalledProcessError:
+            else:
                 logger.error("System Python not found")
                 QMessageBox.warning(self, "错误", "系统环境未找到可用的Python，请安装或设置正确的路径")
                 return False
@@ -1567,14 +1755,22 @@ class MainWindow(QMainWindow):
     def save_env_config(self):
         with open(CONFIG_FILE, 'w') as f:
             json.dump(self.config, f, ensure_ascii=False, indent=4)
+        update_config_cache(self.config)
         logger.info("Inference env configuration saved")
 
     @staticmethod
-    def create_model_combo(options):
+    def create_model_items(options, parent):
+        # Build all rows up front so the combo receives them in a single setModel call
+        model = QStandardItemModel(len(options), 1, parent)
+        for row, (option, tooltip) in enumerate(options.items()):
+            item = QStandardItem(option)
+            item.setData(tooltip, Qt.ToolTipRole)
+            model.setItem(row, 0, item)
+        return model
+
+    def create_model_combo(self, options):
         combo = CustomComboBox()
-        combo.addItems(options.keys())
-        for i, (option, tooltip) in enumerate(options.items()):
-            combo.setItemData(i, tooltip, Qt.ToolTipRole)
+        combo.setModel(self.create_model_items(options, combo))
         return combo
 
     def create_tooltip_label(self):
@@ -1632,6 +1828,10 @@ class MainWindow(QMainWindow):
         label.setText(tooltip)
         tooltip_scroll_area.setVisible(bool(tooltip))
 
+    def on_model_combo_changed(self):
+        combo = self.sender()
+        self.update_tooltip(combo, self.model_combo_tooltips[combo])
+
     def set_background_image(self):
         background = QPixmap(":/images/background3.png")
         if background.isNull():
@@ -1646,13 +1846,30 @@ class MainWindow(QMainWindow):
         painter.drawPixmap(0, 0, overlay)
         painter.end()
 
-        self.background_label = QLabel(self)
-        self.background_label.setPixmap(background)
-        self.background_label.setScaledContents(True)
-        self.background_label.resize(self.size())
-        self.background_label.lower()
+        self.background_pixmap = background
+        self.scaled_background = background.scaled(self.size(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
         self.setAttribute(Qt.WA_StyledBackground, True)
 
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.scaled_background is not None:
+            # Drawn straight onto the window, so no overlay child takes part in layout or polish.
+            # While a resize is still settling the last smooth copy is stretched with a fast transform.
+            painter = QPainter(self)
+            painter.drawPixmap(self.rect(), self.scaled_background)
+            painter.end()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # Follow only the settled size instead of rescaling the background on every drag step
+        self.background_resize_timer.start(16)
+
+    def resize_background(self):
+        if self.background_pixmap is not None:
+            self.scaled_background = self.background_pixmap.scaled(self.size(), Qt.IgnoreAspectRatio,
+                                                                    Qt.SmoothTransformation)
+            self.update()
+
     def select_input_folder(self):
         logger.info("Selecting input folder")
         folder = QFileDialog.getExistingDirectory(self, "Select Input Folder", self.input_folder)
@@ -1681,18 +1898,27 @@ class MainWindow(QMainWindow):
 
     def load_presets(self):
         logger.info("Loading presets")
-        if not os.path.exists('presets'):
+        try:
+            presets_mtime = os.stat('presets').st_mtime_ns
+        except FileNotFoundError:
             os.makedirs('presets')
             logger.info("Created presets directory")
-        preset_files = [f for f in os.listdir('presets') if f.endswith('.json')]
+            presets_mtime = os.stat('presets').st_mtime_ns
+        # Adding or removing a preset file changes the directory mtime, so an unchanged mtime means an unchanged list
+        if presets_mtime == self.presets_mtime:
+            logger.debug("Presets directory unchanged, skipping reload")
+            return
+        with os.scandir('presets') as entries:
+            preset_names = [os.path.splitext(entry.name)[0] for entry in entries
+                            if entry.name.endswith('.json') and entry.is_file()]
         current_preset = self.preset_combo.currentText()
         self.preset_combo.clear()
         self.preset_combo.addItem("Select a preset")  # Default option
-        preset_names = [os.path.splitext(f)[0] for f in preset_files]
         self.preset_combo.addItems(preset_names)
         index = self.preset_combo.findText(current_preset)
         if index >= 0:
             self.preset_combo.setCurrentIndex(index)
+        self.presets_mtime = presets_mtime
         logger.debug(f"Loaded presets: {preset_names}")
 
     def load_preset_from_combo(self, index):
@@ -1808,17 +2034,11 @@ class MainWindow(QMainWindow):
             label = QLabel("以下模型或配置文件缺失，请下载并放置到位后重试：")
             label.setWordWrap(True)
             layout.addWidget(label)
-            text_edit = QTextEdit()
+            text_edit = QPlainTextEdit()
+            text_edit.setObjectName("validation_text")  # styled by the main stylesheet
             text_edit.setReadOnly(True)
+            text_edit.setMaximumBlockCount(10000)
             text_edit.setPlainText(organized_missing)
-            text_edit.setStyleSheet("""
-                    QTextEdit {
-                        background-color: #f0f4f8;
-                        border: 1px solid #dee2e6;
-                        border-radius: 4px;
-                        padding: 8px;
-                    }
-                """)
             layout.addWidget(text_edit)
             button_box = QDialogButtonBox(QDialogButtonBox.Ok)
             button_box.accepted.connect(dialog.accept)
@@ -1869,28 +2089,7 @@ class MainWindow(QMainWindow):
         self.inference_thread.start()
 
         self.run_button.setText("终止推理")
-        run_button_stylesheet = """
-            QPushButton {
-                background-color: #FF4136;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                text-align: center;
-                text-decoration: none;
-                font-size: 14px;
-                margin: 4px 2px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #E02F26;
-            }
-            QPushButton:pressed {
-                background-color: #C7291F;
-                padding-top: 10px;
-                padding-bottom: 6px;
-            }
-        """
-        self.run_button.setStyleSheet(ScalingUtils.scale_stylesheet(run_button_stylesheet, self.scaling_factor))
+        self.set_run_button_state("stop")
         self.run_button.clicked.disconnect()
         self.run_button.clicked.connect(self.stop_inference)
 
@@ -1908,31 +2107,33 @@ class MainWindow(QMainWindow):
 
     def reset_run_button(self):
         self.run_button.setText("开始推理")
-        self.run_button.setStyleSheet("")  # This will reset to the default style defined in setStyleSheet
+        self.set_run_button_state("run")
         self.run_button.clicked.disconnect()
         self.run_button.clicked.connect(self.run_inference)
 
-    def process_inference_output(self, text, is_progress_update):
+    def set_run_button_state(self, state):
+        # Both looks live in the main stylesheet, re-polishing just picks up the matching [state] rule
+        self.run_button.setProperty("state", state)
+        self.run_button.style().unpolish(self.run_button)
+        self.run_button.style().polish(self.run_button)
+
+    def process_inference_output(self, lines, is_progress_update):
         cursor = self.output_console.textCursor()
         cursor.movePosition(QTextCursor.End)
 
         if is_progress_update:
+            # Every progress line overwrites the previous one, so only the latest of the batch is drawn
             cursor.movePosition(QTextCursor.StartOfLine, QTextCursor.KeepAnchor)
             cursor.removeSelectedText()
-            self.update_output(text, color='#ffa500', auto_newline=False)
+            self.update_output(lines[-1], color='#ffa500', auto_newline=False)
         else:
-            if text.startswith("使用模块:"):
-                self.print_separator(char='=')
-                self.update_output(text, color='#6e71ff')
-            elif text.startswith("命令:"):
-                self.update_output(text, color='yellow', italic=True)
-                self.print_separator(char='-')
-            elif "error" in text.lower():
-                self.update_output(text, color='red')
-            elif "warning" in text.lower():
-                self.update_output(text, color='orange')
-            else:
-                self.update_output(text)
+            for text in lines:
+                color, italic, separator_before, separator_after = OUTPUT_LINE_STYLES[classify_output_line(text)]
+                if separator_before:
+                    self.print_separator(char=separator_before)
+                self.update_output(text, color=color, italic=italic)
+                if separator_after:
+                    self.print_separator(char=separator_after)
 
         self.output_console.setTextCursor(cursor)
         self.output_console.ensureCursorVisible()
@@ -1955,12 +2156,15 @@ class MainWindow(QMainWindow):
 
     def update_output(self, text, color='white', bold=False, italic=False, auto_newline=True):
         cursor = self.output_console.textCursor()
-        format = QTextCharFormat()
-        format.setForeground(QColor(color))
-        if bold:
-            format.setFontWeight(QFont.Bold)
-        if italic:
-            format.setFontItalic(True)
+        format = self.text_formats.get((color, bold, italic))
+        if format is None:
+            format = QTextCharFormat()
+            format.setForeground(QColor(color))
+            if bold:
+                format.setFontWeight(QFont.Bold)
+            if italic:
+                format.setFontItalic(True)
+            self.text_formats[(color, bold, italic)] = format
         cursor.movePosition(QTextCursor.End)
         cursor.insertText(text + ('\n' if auto_newline else ''), format)
         self.output_console.setTextCursor(cursor)
@@ -1986,97 +2190,143 @@ class MainWindow(QMainWindow):
             return True, []
 
         fast_inference = self.fast_inference_checkbox.isChecked()
+        config_paths = {}
+        for module_name, model in selected_models:
+            paths = self.config["config_paths"].get(model, [None, None])
+            config_paths[model] = paths[1] if fast_inference else paths[0]
+        directories = {"pretrain"} | {os.path.dirname(path) or "." for path in config_paths.values() if path}
+        drives = {os.path.splitdrive(os.path.abspath(directory))[0] for directory in directories}
+        if len(drives) > 1:
+            # Listings on separate (possibly network) drives can overlap; on one drive the thread hop costs more
+            if self.scan_executor is None:
+                self.scan_executor = ThreadPoolExecutor(max_workers=2)
+            dir_names = dict(zip(directories, self.scan_executor.map(self.scan_dir_names, directories)))
+        else:
+            dir_names = {directory: self.scan_dir_names(directory) for directory in directories}
         for module_name, model in selected_models:
             model_path = os.path.join("pretrain", model)
-            if not os.path.exists(model_path):
-                missing_items.append(f"{module_name} - 缺失模型文件: {model}")
-            config_paths = self.config["config_paths"].get(model, [None, None])
-            config_path = config_paths[1] if fast_inference else config_paths[0]
+            if not self.file_in_snapshot(model_path, dir_names):
+                missing_items.append((module_name, f"缺失模型文件: {model}"))
+            config_path = config_paths[model]
             if not config_path:
                 config_type = "快速" if fast_inference else "标准"
-                missing_items.append(f"{module_name} - 缺失{config_type}配置文件路径")
-            elif not os.path.exists(config_path):
+                missing_items.append((module_name, f"缺失{config_type}配置文件路径"))
+            elif not self.file_in_snapshot(config_path, dir_names):
                 config_type = "快速" if fast_inference else "标准"
-                missing_items.append(f"{module_name} - 缺失{config_type}配置文件: {os.path.basename(config_path)}")
+                missing_items.append((module_name, f"缺失{config_type}配置文件: {os.path.basename(config_path)}"))
         return len(missing_items) == 0, missing_items
 
+    @staticmethod
+    def scan_dir_names(directory):
+        try:
+            with os.scandir(directory) as entries:
+                return {os.path.normcase(entry.name) for entry in entries}
+        except (FileNotFoundError, NotADirectoryError):
+            return set()
+
+    def file_in_snapshot(self, path, dir_names):
+        # Scan each directory once and answer later lookups from the cached name set
+        directory, name = os.path.split(path)
+        directory = directory or "."
+        if directory not in dir_names:
+            dir_names[directory] = self.scan_dir_names(directory)
+        return os.path.normcase(name) in dir_names[directory]
+
     @staticmethod
     def organize_missing_items(missing_items):
-        organized = {}
-        for item in missing_items:
-            if " - " in item:
-                module_part, detail_part = item.split(" - ", 1)
-                if module_part not in organized:
-                    organized[module_part] = []
-                organized[module_part].append(detail_part)
-            else:
-                if "其他" not in organized:
-                    organized["其他"] = []
-                organized["其他"].append(item)
-        output = []
+        organized = defaultdict(list)
+        for module_name, detail in missing_items:
+            organized[module_name].append(detail)
+        buf = io.StringIO()
         for module, items in organized.items():
-            output.append(f"【{module}】")
+            buf.write(f"【{module}】\n")
             for item in items:
-                output.append(f"  • {item}")
-            output.append("")
-        output.append("【步骤】")
-        output.append("1.请下载上述缺失的模型及其配置文件。")
-        output.append("2.将模型放入pretrain文件夹，配置文件放入configs文件夹。")
-        output.append("3.重新执行推理。")
-        output.append("4.是的，没有也不会做自动下载or更新，我希望它保持完全离线。")
-        output.append("\n◆ 只要保证文件正确任何途径下载的模型都是可用的，我应该也会在B站视频简介提供一份网盘分流，可搜索我的ID【领航员未鸟】寻找。")
-        return "\n".join(output)
+                buf.write(f"  • {item}\n")
+            buf.write("\n")
+        buf.write("【步骤】\n")
+        buf.write("1.请下载上述缺失的模型及其配置文件。\n")
+        buf.write("2.将模型放入pretrain文件夹，配置文件放入configs文件夹。\n")
+        buf.write("3.重新执行推理。\n")
+        buf.write("4.是的，没有也不会做自动下载or更新，我希望它保持完全离线。\n")
+        buf.write("\n◆ 只要保证文件正确任何途径下载的模型都是可用的，我应该也会在B站视频简介提供一份网盘分流，可搜索我的ID【领航员未鸟】寻找。")
+        return buf.getvalue()
 
     def run_archive(self):
+        # archive_folders moves and deletes input/ and the result folders, so it must not overlap inference
+        if self.inference_thread is not None and self.inference_thread.isRunning():
+            QMessageBox.warning(self, "错误", "推理正在进行中，请等待完成或停止推理后再归档")
+            return
         logger.info("Starting archive process")
 
         self.output_console.clear()
         self.update_output("开始进行归档处理...", color='green')
         self.print_separator()
 
-        def archive_output_callback(text):
-            self.update_output(text, color='#6e71ff')
+        self.archive_button.setEnabled(False)
+        self.run_button.setEnabled(False)
+        self.archive_thread = ArchiveThread()
+        self.archive_thread.output_signal.connect(self.archive_output)
+        self.archive_thread.finished_signal.connect(self.archive_finished)
+        self.archive_thread.start()
 
-        try:
-            archive_folders(output_callback=archive_output_callback)
+    def archive_output(self, text):
+        self.update_output(text, color='#6e71ff')
 
+    def archive_finished(self, error):
+        self.archive_button.setEnabled(True)
+        self.run_button.setEnabled(True)
+        if not error:
             logger.info("Archive process completed")
             self.print_separator()
             self.update_output("归档完成！", color='green')
             self.print_separator()
-        except Exception as e:
-            error_msg = f"归档过程中发生错误: {str(e)}"
-            logger.error(f"Archive process failed: {error_msg}")
-            self.update_output("归档过程发生错误！", color='red')
-            self.update_output(error_msg, color='red')
-            self.print_separator()
-            QMessageBox.critical(
-                self,
-                "归档错误",
-                f"归档过程中发生错误：\n\n{str(e)}\n\n请检查文件是否被其他程序占用，然后重试。"
-            )
+            return
+        error_msg = f"归档过程中发生错误: {error}"
+        logger.error(f"Archive process failed: {error_msg}")
+        self.update_output("归档过程发生错误！", color='red')
+        self.update_output(error_msg, color='red')
+        self.print_separator()
+        if self.archive_error_box is None:
+            self.archive_error_box = QMessageBox(QMessageBox.Critical, "归档错误", "", QMessageBox.Ok, self)
+        self.archive_error_box.setText(f"归档过程中发生错误：\n\n{error}\n\n请检查文件是否被其他程序占用，然后重试。")
+        self.archive_error_box.exec_()
+
+    def closeEvent(self, event):
+        # Destroying a running QThread aborts the process, possibly in the middle of a shutil.move
+        if self.archive_thread is not None and self.archive_thread.isRunning():
+            QMessageBox.warning(self, "正在归档", "归档仍在进行中，请等待完成后再关闭窗口")
+            event.ignore()
+            return
+        if self.scan_executor is not None:
+            self.scan_executor.shutdown(wait=False)
+        super().closeEvent(event)
 
     def open_config_editor(self):
         dialog = ConfigEditorDialog(self.config, self)
         if dialog.exec_():
-            self.config = load_or_create_config()  # Reload the config from file
+            self.config = load_or_create_config()  # Served from config_cache unless the file changed on disk
             self.update_model_combos()
 
     def update_model_combos(self):
-        self.update_single_combo(self.vocal_model_combo, self.vocal_model_tooltip, self.config["vocal_models"])
-        self.update_single_combo(self.kara_model_combo, self.kara_model_tooltip, self.config["kara_models"])
-        self.update_single_combo(self.reverb_model_combo, self.reverb_model_tooltip, self.config["reverb_models"])
-        self.update_single_combo(self.other_model_combo, self.other_model_tooltip, self.config["other_models"])
+        # Suspend painting while all four combos are rebuilt; re-enabling schedules a single repaint
+        self.setUpdatesEnabled(False)
+        try:
+            self.update_single_combo(self.vocal_model_combo, self.vocal_model_tooltip, self.config["vocal_models"])
+            self.update_single_combo(self.kara_model_combo, self.kara_model_tooltip, self.config["kara_models"])
+            self.update_single_combo(self.reverb_model_combo, self.reverb_model_tooltip, self.config["reverb_models"])
+            self.update_single_combo(self.other_model_combo, self.other_model_tooltip, self.config["other_models"])
+        finally:
+            self.setUpdatesEnabled(True)
 
     def update_single_combo(self, combo, tooltip_label, options):
         current_text = combo.currentText()
-        combo.clear()
-        combo.addItems(options.keys())
-        for i, (option, tooltip) in enumerate(options.items()):
-            combo.setItemData(i, tooltip, Qt.ToolTipRole)
-        index = combo.findText(current_text)
-        if index >= 0:
-            combo.setCurrentIndex(index)
+        # The previous model is parented to the combo, so Qt frees it when it is replaced
+        combo.blockSignals(True)
+        combo.setModel(self.create_model_items(options, combo))
+        # Rows follow the dict order, so the previous selection's row comes straight from options
+        rows = {option: row for row, option in enumerate(options)}
+        combo.setCurrentIndex(rows.get(current_text, 0))
+        combo.blockSignals(False)
         self.update_tooltip(combo, tooltip_label)
 
     def print_system_info(self):
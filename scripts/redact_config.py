@@ -29,7 +29,8 @@ def save_config(config: Union[ConfigDict, OmegaConf], save_path: str):
     try:
         with open(save_path, 'w') as f:
             if isinstance(config, ConfigDict):
-                yaml.dump(config.to_dict(), f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+                yaml.dump(config.to_dict(), f, Dumper=getattr(yaml, 'CDumper', yaml.Dumper), default_flow_style=False,
+                          sort_keys=False, allow_unicode=True)
             elif isinstance(config, OmegaConf):
                 OmegaConf.save(config, save_path)
             else:
@@ -12,6 +12,9 @@ from ml_collections import ConfigDict
 import torch.distributed as dist
 from torch import nn
 
+# libyaml-backed loader when PyYAML was built with it; same FullLoader semantics (configs use !!python/tuple)
+YAML_LOADER = getattr(yaml, 'CFullLoader', yaml.FullLoader)
+
 
 def parse_args_train(dict_args: Union[Dict, None]) -> argparse.Namespace:
     """
@@ -228,9 +231,9 @@ def load_config(model_type: str, config_path: str) -> Union[ConfigDict, OmegaCon
     try:
         with open(config_path, 'r') as f:
             if model_type == 'htdemucs':
-                config = OmegaConf.load(config_path)
+                config = OmegaConf.load(f)
             else:
-                config = ConfigDict(yaml.load(f, Loader=yaml.FullLoader))
+                config = ConfigDict(yaml.load(f, Loader=YAML_LOADER))
             return config
     except FileNotFoundError:
         raise FileNotFoundError(f"Configuration file not found at {config_path}")